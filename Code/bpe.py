@@ -14,11 +14,28 @@ This reduces vocabulary size while preserving subword semantics.
 
 import os
 import re
+import sys
 import json
+import heapq
 import pickle
+import itertools
+from array import array
 from collections import defaultdict, Counter
 
 class BPETokenizer:
+    # Maximum number of distinct words kept in the encode cache
+    ENCODE_CACHE_SIZE = 100_000
+    
+    # Special tokens like <EOS> or any run of non-space characters
+    _WORD_RE = re.compile(r'<[A-Z]+>|\S+')
+    
+    # Invisible special token characters -> visible markers
+    _MARKER_TABLE = str.maketrans({
+        '\ue000': ' <EOS> ',
+        '\ue001': ' <EOP> ',
+        '\ue002': ' <EOT> ',
+    })
+    
     def __init__(self, vocab_size=250):
         """
         Initialize BPE tokenizer
@@ -28,7 +45,11 @@ class BPETokenizer:
         self.vocab_size = vocab_size
         self.vocab = set()  # Set of all tokens
         self.merges = {}    # Dictionary: (token1, token2) -> merged_token
-        self.word_freqs = {}  # Word frequencies from corpus
+        self.word_freqs = {}  # Word (tuple of symbols) -> frequency in corpus
+        self._encode_cache = {}  # Word -> encoded tokens (reset when merges change)
+        self._merge_rank = {}    # (token1, token2) -> order the merge was learned in
+        self._token2id = None    # Built lazily from vocab (reset when vocab changes)
+        self._id2token = None
         
         # Special tokens
         self.special_tokens = ['<PAD>', '<UNK>', '<BOS>', '<EOS>', '<EOP>', '<EOT>']
@@ -41,37 +62,34 @@ class BPETokenizer:
         print("STEP 1: Reading corpus and building word frequency dictionary")
         print("=" * 80)
         
-        with open(corpus_file, 'r', encoding='utf-8') as f:
-            text = f.read()
-        
-        print(f"Corpus size: {len(text):,} characters")
-        
-        # Split into words
-        # Replace invisible special tokens with visible markers
-        text = text.replace('\ue000', ' <EOS> ')
-        text = text.replace('\ue001', ' <EOP> ')
-        text = text.replace('\ue002', ' <EOT> ')
+        # Stream the corpus line by line and count words as we go, so the
+        # full text and the full word list are never held in memory
+        word_counts = Counter()
+        num_chars = 0
         
-        # Tokenize into words
-        words = re.findall(r'<[A-Z]+>|\S+', text)
-        
-        print(f"Total words: {len(words):,}")
-        
-        # Count word frequencies
-        word_counts = Counter(words)
+        with open(corpus_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                num_chars += len(line)
+                
+                # Replace invisible special tokens with visible markers,
+                # then tokenize into words
+                line = line.translate(self._MARKER_TABLE)
+                word_counts.update(self._WORD_RE.findall(line))
+        
+        print(f"Corpus size: {num_chars:,} characters")
+        print(f"Total words: {sum(word_counts.values()):,}")
         print(f"Unique words: {len(word_counts):,}")
         
         # Convert to character-level representation
-        # Add space between characters and mark word end with </w>
+        # Split each word into a tuple of symbols once and mark word end with </w>
         self.word_freqs = {}
         for word, freq in word_counts.items():
-            # Split into characters: "hello" -> "h e l l o </w>"
-            char_word = ' '.join(list(word)) + ' </w>'
-            self.word_freqs[char_word] = freq
+            # Split into characters: "hello" -> ('h', 'e', 'l', 'l', 'o', '</w>')
+            self.word_freqs[tuple(word) + ('</w>',)] = freq
         
         print(f"\nExample word representations:")
-        for i, (word, freq) in enumerate(list(self.word_freqs.items())[:5]):
-            print(f"  {word[:50]}... (freq: {freq})")
+        for i, (word, freq) in enumerate(itertools.islice(self.word_freqs.items(), 5)):
+            print(f"  {' '.join(word)[:50]}... (freq: {freq})")
         
         return self.word_freqs
     
@@ -79,16 +97,16 @@ class BPETokenizer:
         """
         Step 2: Get all bigrams (adjacent token pairs) with their frequencies
         
+        Standalone version of the step: train() does not call this, it
+        keeps its own pair counts and updates them incrementally.
+        
         Returns: Counter of (token1, token2) -> frequency
         """
         pairs = defaultdict(int)
         
-        for word, freq in self.word_freqs.items():
-            symbols = word.split()
-            
+        for symbols, freq in self.word_freqs.items():
             # Get all adjacent pairs
-            for i in range(len(symbols) - 1):
-                pair = (symbols[i], symbols[i + 1])
+            for pair in zip(symbols, symbols[1:]):
                 pairs[pair] += freq
         
         return pairs
@@ -97,6 +115,9 @@ class BPETokenizer:
         """
         Step 3: Merge the most frequent pair in all words
         
+        Standalone version of the step: train() does not call this, it only
+        re-merges the words that contain the pair (via merge_symbols).
+        
         pair: (token1, token2) to merge
         """
         # Create merged token (no space)
@@ -105,19 +126,35 @@ class BPETokenizer:
         # Update all words
         new_word_freqs = {}
         
-        # Pattern to find and replace the pair
-        bigram = ' '.join(pair)
-        replacement = merged
-        
-        for word, freq in self.word_freqs.items():
+        for symbols, freq in self.word_freqs.items():
             # Replace all occurrences of the pair with merged token
-            new_word = word.replace(bigram, replacement)
-            new_word_freqs[new_word] = freq
+            new_symbols = tuple(self.merge_symbols(symbols, pair, merged))
+            new_word_freqs[new_symbols] = freq
         
         self.word_freqs = new_word_freqs
         
         return merged
     
+    @staticmethod
+    def merge_symbols(symbols, pair, merged):
+        """
+        Merge every occurrence of pair in a list of symbols (left to right)
+        
+        Returns: new list of symbols
+        """
+        new_symbols = []
+        i = 0
+        
+        while i < len(symbols):
+            if i < len(symbols) - 1 and symbols[i] == pair[0] and symbols[i + 1] == pair[1]:
+                new_symbols.append(merged)
+                i += 2
+            else:
+                new_symbols.append(symbols[i])
+                i += 1
+        
+        return new_symbols
+    
     def train(self, corpus_file):
         """
         Main BPE training algorithm
@@ -141,13 +178,12 @@ class BPETokenizer:
             self.vocab.add(token)
         
         # Add all individual characters from words
-        for word in self.word_freqs.keys():
-            for char in word.split():
-                self.vocab.add(char)
+        for symbols in self.word_freqs.keys():
+            self.vocab.update(symbols)
         
         print(f"Initial vocabulary size: {len(self.vocab)}")
         print(f"Special tokens: {self.special_tokens}")
-        print(f"Sample characters: {list(self.vocab)[:20]}")
+        print(f"Sample characters: {list(itertools.islice(self.vocab, 20))}")
         
         # Calculate how many merges we need
         num_merges = self.vocab_size - len(self.vocab)
@@ -159,20 +195,91 @@ class BPETokenizer:
         print(f"STEP 3: Performing {num_merges} BPE merge operations")
         print("=" * 80)
         
+        # Keep words as parallel lists (symbols, frequency) plus an inverted
+        # index pair -> word ids, so each merge only re-scans the words that
+        # actually contain the merged pair instead of the whole corpus.
+        # Symbols are interned to small int ids so the merge loop compares
+        # and hashes ints rather than strings
+        id2sym = sorted(self.vocab)
+        sym2id = {sym: sym_id for sym_id, sym in enumerate(id2sym)}
+        words = [[sym2id[sym] for sym in symbols] for symbols in self.word_freqs]
+        freqs = list(self.word_freqs.values())
+        pair_counts = Counter()
+        pair_index = defaultdict(set)
+        
+        for word_id, symbols in enumerate(words):
+            freq = freqs[word_id]
+            for i in range(len(symbols) - 1):
+                pair = (symbols[i], symbols[i + 1])
+                pair_counts[pair] += freq
+                pair_index[pair].add(word_id)
+        
+        # Max-heap of (-count, pair) with lazy invalidation: a new entry is
+        # pushed whenever a count changes and stale entries are skipped on pop
+        heap = [(-count, pair) for pair, count in pair_counts.items()]
+        heapq.heapify(heap)
+        
         for i in range(num_merges):
-            # Get all bigram frequencies
-            pairs = self.get_pairs()
+            # Find most frequent pair
+            best_ids = None
+            while heap:
+                neg_freq, pair = heapq.heappop(heap)
+                if -neg_freq > 0 and -neg_freq == pair_counts.get(pair, 0):
+                    best_ids, best_freq = pair, -neg_freq
+                    break
             
-            if not pairs:
+            if best_ids is None:
                 print(f"\nNo more pairs to merge. Stopping at {len(self.vocab)} tokens.")
                 break
             
-            # Find most frequent pair
-            best_pair = max(pairs, key=pairs.get)
-            best_freq = pairs[best_pair]
+            best_pair = (id2sym[best_ids[0]], id2sym[best_ids[1]])
+            merged_token = ''.join(best_pair)
+            
+            # Different pairs can spell the same token ('ab' + 'c', 'a' + 'bc')
+            merged_id = sym2id.get(merged_token)
+            if merged_id is None:
+                merged_id = sym2id[merged_token] = len(id2sym)
+                id2sym.append(merged_token)
+            
+            # Merge the pair only in the words that contain it
+            changed = set()
+            for word_id in pair_index.pop(best_ids):
+                symbols = words[word_id]
+                freq = freqs[word_id]
+                new_symbols = self.merge_symbols(symbols, best_ids, merged_id)
+                
+                old_pairs = Counter(zip(symbols, symbols[1:]))
+                new_pairs = Counter(zip(new_symbols, new_symbols[1:]))
+                
+                # Update the pairs this word already had, skipping the ones
+                # the merge left untouched ...
+                for pair, count in old_pairs.items():
+                    delta = new_pairs.pop(pair, 0) - count
+                    if delta:
+                        pair_counts[pair] += delta * freq
+                        changed.add(pair)
+                        if delta == -count and pair != best_ids:
+                            pair_index[pair].discard(word_id)
+                
+                # ... and add the pairs the merge created
+                for pair, count in new_pairs.items():
+                    pair_counts[pair] += count * freq
+                    changed.add(pair)
+                    pair_index[pair].add(word_id)
+                
+                words[word_id] = new_symbols
+            
+            del pair_counts[best_ids]
+            changed.discard(best_ids)
             
-            # Merge the pair
-            merged_token = self.merge_vocab(best_pair)
+            for pair in changed:
+                if pair_counts[pair] > 0:
+                    heapq.heappush(heap, (-pair_counts[pair], pair))
+                else:
+                    # Drop pairs that no longer occur so both tables only
+                    # hold live pairs
+                    del pair_counts[pair]
+                    del pair_index[pair]
             
             # Store the merge rule
             self.merges[best_pair] = merged_token
@@ -184,6 +291,18 @@ class BPETokenizer:
             if (i + 1) % 10 == 0 or i < 10:
                 print(f"Merge {i+1:3d}/{num_merges}: ('{best_pair[0]}', '{best_pair[1]}') -> '{merged_token}' [freq: {best_freq:,}]")
         
+        # Keep word_freqs in sync with the merged words
+        self.word_freqs = {
+            tuple(id2sym[sym_id] for sym_id in symbols): freq
+            for symbols, freq in zip(words, freqs)
+        }
+        
+        # Merge rules and vocab changed, cached encodings and ID maps are stale
+        self._merge_rank = {pair: rank for rank, pair in enumerate(self.merges)}
+        self._encode_cache = {}
+        self._token2id = None
+        self._id2token = None
+        
         print("\n" + "=" * 80)
         print("TRAINING COMPLETE!")
         print("=" * 80)
@@ -203,39 +322,136 @@ class BPETokenizer:
         3. Apply merge operations in order
         4. Return list of tokens
         """
-        # Replace invisible tokens
-        text = text.replace('\ue000', ' <EOS> ')
-        text = text.replace('\ue001', ' <EOP> ')
-        text = text.replace('\ue002', ' <EOT> ')
-        
-        # Split into words
-        words = re.findall(r'<[A-Z]+>|\S+', text)
-        
         encoded_words = []
         
-        for word in words:
+        for word in self._split_words(text):
             # Handle special tokens
             if word in self.special_tokens:
                 encoded_words.append(word)
                 continue
             
-            # Split into characters and add word boundary
-            tokens = list(word) + ['</w>']
+            encoded_words.extend(self._encode_word(word))
+        
+        return encoded_words
+    
+    def encode_ids(self, text):
+        """
+        Encode text straight to integer IDs (encode + token_to_id in one pass)
+        
+        Returns: array('i') of IDs. It supports the buffer protocol, so
+        np.frombuffer / torch.frombuffer can wrap it without a copy.
+        """
+        token2id = self._get_t2i()
+        unk_id = token2id['<UNK>']
+        ids = array('i')
+        
+        for word in self._split_words(text):
+            # Handle special tokens
+            if word in self.special_tokens:
+                ids.append(token2id.get(word, unk_id))
+                continue
             
-            # Apply merge operations in order they were learned
-            for pair, merged in self.merges.items():
-                i = 0
-                while i < len(tokens) - 1:
-                    # Check if current pair matches
-                    if (tokens[i], tokens[i + 1]) == pair:
-                        # Merge them
-                        tokens = tokens[:i] + [merged] + tokens[i + 2:]
-                    else:
-                        i += 1
+            ids.extend([token2id.get(token, unk_id) for token in self._encode_word(word)])
+        
+        return ids
+    
+    def encode_batch(self, texts):
+        """
+        Encode a batch of texts into one flat ID array
+        
+        Returns: (ids, offsets) where the IDs of texts[i] are
+        ids[offsets[i]:offsets[i + 1]]
+        """
+        ids = array('i')
+        offsets = array('q', [0])
+        
+        for text in texts:
+            ids.extend(self.encode_ids(text))
+            offsets.append(len(ids))
+        
+        return ids, offsets
+    
+    def _split_words(self, text):
+        """
+        Split text into words, turning invisible special tokens into markers
+        """
+        # Replace invisible tokens
+        text = text.translate(self._MARKER_TABLE)
+        
+        # Split into words
+        return self._WORD_RE.findall(text)
+    
+    def _encode_word(self, word):
+        """
+        Encode a single word, caching the result
+        
+        Natural text repeats the same words constantly, so each distinct
+        word only goes through the merge loop once.
+        
+        Instead of trying every learned merge in order, the adjacent pairs
+        that have a merge rule go into a min-heap keyed on (rank, position)
+        and the lowest-rank pair is merged until none is left. This gives
+        the same tokens as applying the merges in order, in O(L log L)
+        rather than O(len(merges) * L).
+        """
+        tokens = self._encode_cache.get(word)
+        if tokens is not None:
+            return tokens
+        
+        # Split into characters and add word boundary
+        symbols = list(word) + ['</w>']
+        n = len(symbols)
+        
+        # Doubly-linked list over positions: a merge keeps the left symbol
+        # and unlinks the right one (set to None)
+        prev_pos = list(range(-1, n - 1))
+        next_pos = list(range(1, n + 1))
+        
+        merge_rank = self._merge_rank
+        heap = []
+        for i in range(n - 1):
+            rank = merge_rank.get((symbols[i], symbols[i + 1]))
+            if rank is not None:
+                heap.append((rank, i))
+        heapq.heapify(heap)
+        
+        while heap:
+            rank, i = heapq.heappop(heap)
+            j = next_pos[i] if symbols[i] is not None else n
+            
+            # Skip entries made stale by an earlier merge
+            if j >= n or merge_rank.get((symbols[i], symbols[j])) != rank:
+                continue
+            
+            # Merge symbols[i] and symbols[j] into position i
+            symbols[i] = self.merges[(symbols[i], symbols[j])]
+            symbols[j] = None
+            next_pos[i] = next_pos[j]
+            if next_pos[i] < n:
+                prev_pos[next_pos[i]] = i
+            
+            # Queue the new pairs on both sides. Rules ranked below the
+            # current one have already been applied in order, so they are
+            # not revisited
+            left = prev_pos[i]
+            if left >= 0:
+                new_rank = merge_rank.get((symbols[left], symbols[i]))
+                if new_rank is not None and new_rank > rank:
+                    heapq.heappush(heap, (new_rank, left))
             
-            encoded_words.extend(tokens)
+            right = next_pos[i]
+            if right < n:
+                new_rank = merge_rank.get((symbols[i], symbols[right]))
+                if new_rank is not None and new_rank > rank:
+                    heapq.heappush(heap, (new_rank, i))
         
-        return encoded_words
+        tokens = tuple(symbol for symbol in symbols if symbol is not None)
+        
+        if len(self._encode_cache) >= self.ENCODE_CACHE_SIZE:
+            self._encode_cache.clear()
+        self._encode_cache[word] = tokens
+        
+        return tokens
     
     def decode(self, tokens):
         """
@@ -256,62 +472,66 @@ class BPETokenizer:
         
         return text.strip()
     
+    def _get_t2i(self):
+        """
+        Get the token -> ID mapping, building both ID maps on first use
+        """
+        if self._token2id is None:
+            vocab_list = sorted(self.vocab)
+            self._token2id = {token: i for i, token in enumerate(vocab_list)}
+            self._id2token = {i: token for i, token in enumerate(vocab_list)}
+        
+        return self._token2id
+    
+    def _get_i2t(self):
+        """
+        Get the ID -> token mapping, building both ID maps on first use
+        """
+        self._get_t2i()
+        return self._id2token
+    
     def token_to_id(self, tokens):
         """
         Convert tokens to integer IDs
         """
-        # Create token to ID mapping
-        vocab_list = sorted(list(self.vocab))
-        token2id = {token: i for i, token in enumerate(vocab_list)}
-        
-        # Convert tokens to IDs
-        ids = []
-        for token in tokens:
-            if token in token2id:
-                ids.append(token2id[token])
-            else:
-                # Unknown token
-                ids.append(token2id['<UNK>'])
+        token2id = self._get_t2i()
         
-        return ids
+        # Convert tokens to IDs, unknown tokens map to <UNK>
+        unk_id = token2id['<UNK>']
+        return [token2id.get(token, unk_id) for token in tokens]
     
     def id_to_token(self, ids):
         """
         Convert integer IDs back to tokens
         """
-        # Create ID to token mapping
-        vocab_list = sorted(list(self.vocab))
-        id2token = {i: token for i, token in enumerate(vocab_list)}
+        id2token = self._get_i2t()
         
         # Convert IDs to tokens
-        tokens = []
-        for id in ids:
-            if id in id2token:
-                tokens.append(id2token[id])
-            else:
-                tokens.append('<UNK>')
-        
-        return tokens
+        return [id2token.get(id, '<UNK>') for id in ids]
     
-    def save(self, filepath='bpe_tokenizer_v250.pkl'):
+    def save(self, filepath='bpe_tokenizer_v250.json'):
         """
         Save tokenizer (vocab and merge rules)
+        
+        Plain JSON: vocab is the sorted token list (ID = index) and merges
+        is the ordered list of [token1, token2] pairs (rank = index).
         """
         data = {
-            'vocab': list(self.vocab),
-            'merges': self.merges,
+            'vocab': sorted(self.vocab),
+            'merges': [[a, b] for (a, b) in self.merges],
             'vocab_size': self.vocab_size,
             'special_tokens': self.special_tokens,
         }
         
-        # Save as pickle
-        with open(filepath, 'wb') as f:
-            pickle.dump(data, f)
+        # Save as JSON
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
         
         print(f"\n💾 Tokenizer saved to: {filepath}")
         
         # Save merges as text file for inspection
-        merges_file = filepath.replace('.pkl', '_merges.txt')
+        base_path = os.path.splitext(filepath)[0]
+        merges_file = base_path + '_merges.txt'
         with open(merges_file, 'w', encoding='utf-8') as f:
             f.write("# BPE Merge Operations\n")
             f.write("# Format: token1 token2 -> merged_token\n")
@@ -323,7 +543,7 @@ class BPETokenizer:
         print(f"💾 Merge rules saved to: {merges_file}")
         
         # Save vocabulary as text file
-        vocab_file = filepath.replace('.pkl', '_vocab.txt')
+        vocab_file = base_path + '_vocab.txt'
         with open(vocab_file, 'w', encoding='utf-8') as f:
             f.write("# BPE Tokenizer Vocabulary\n")
             f.write(f"# Size: {len(self.vocab)}\n")
@@ -335,17 +555,39 @@ class BPETokenizer:
         
         print(f"💾 Vocabulary saved to: {vocab_file}")
     
-    def load(self, filepath='bpe_tokenizer_v250.pkl'):
+    def load(self, filepath='bpe_tokenizer_v250.json'):
         """
         Load tokenizer from file
         """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        # Merges are stored in rank order as [token1, token2]
+        data['merges'] = {(a, b): a + b for a, b in data['merges']}
+        
+        self._set_state(data, filepath)
+    
+    def load_pickle(self, filepath='bpe_tokenizer_v250.pkl'):
+        """
+        Load tokenizer from the old pickle format
+        """
         with open(filepath, 'rb') as f:
             data = pickle.load(f)
         
+        self._set_state(data, filepath)
+    
+    def _set_state(self, data, filepath):
+        """
+        Restore tokenizer state from loaded data
+        """
         self.vocab = set(data['vocab'])
         self.merges = data['merges']
         self.vocab_size = data['vocab_size']
         self.special_tokens = data['special_tokens']
+        self._merge_rank = {pair: rank for rank, pair in enumerate(self.merges)}
+        self._encode_cache = {}
+        self._token2id = None
+        self._id2token = None
         
         print(f"✓ Tokenizer loaded from: {filepath}")
         print(f"  Vocabulary size: {len(self.vocab)}")
@@ -403,7 +645,7 @@ def show_merge_examples(tokenizer, num_examples=20):
     
     print(f"\nShowing first {num_examples} merge operations:\n")
     
-    for i, (pair, merged) in enumerate(list(tokenizer.merges.items())[:num_examples], 1):
+    for i, (pair, merged) in enumerate(itertools.islice(tokenizer.merges.items(), num_examples), 1):
         print(f"{i:2d}. ('{pair[0]}', '{pair[1]}') → '{merged}'")
     
     print(f"\n... and {len(tokenizer.merges) - num_examples} more merges")
@@ -414,6 +656,11 @@ def main():
     """
     Main training function
     """
+    # Block-buffer stdout so training progress lines are not flushed one
+    # write at a time on a terminal
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(line_buffering=False)
+    
     print("\n" + "=" * 80)
     print("CLASSIC BPE TOKENIZER - FROM SCRATCH")
     print("No pre-built libraries!")
@@ -459,18 +706,18 @@ def main():
     test_tokenizer(tokenizer)
     
     # Save tokenizer
-    tokenizer.save('bpe_tokenizer_v250.pkl')
+    tokenizer.save('bpe_tokenizer_v250.json')
     
     print("\n" + "=" * 80)
     print("✅ TRAINING COMPLETE!")
     print("=" * 80)
     print("\nFiles created:")
-    print("  1. bpe_tokenizer_v250.pkl         - Tokenizer model")
+    print("  1. bpe_tokenizer_v250.json        - Tokenizer model")
     print("  2. bpe_tokenizer_v250_merges.txt  - Merge operations")
     print("  3. bpe_tokenizer_v250_vocab.txt   - Vocabulary list")
     print("\nUsage:")
     print("  tokenizer = BPETokenizer()")
-    print("  tokenizer.load('bpe_tokenizer_v250.pkl')")
+    print("  tokenizer.load('bpe_tokenizer_v250.json')")
     print("  tokens = tokenizer.encode('ایک جملہ')")
     print("  ids = tokenizer.token_to_id(tokens)")
     print("=" * 80)
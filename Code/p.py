@@ -8,6 +8,8 @@ Adds special tokens using unused Unicode private use area characters:
 
 import os
 import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 class SpecialTokenInjector:
@@ -25,6 +27,7 @@ class SpecialTokenInjector:
         
         # Sentence-ending punctuation in Urdu
         self.sentence_endings = ['۔', '؟', '!']
+        self._eos_re = re.compile('|'.join(re.escape(p) for p in self.sentence_endings))
         
         self.stats = {
             'files_processed': 0,
@@ -35,18 +38,9 @@ class SpecialTokenInjector:
     
     def add_sentence_markers(self, text):
         """Add <EOS> after sentence-ending punctuation"""
-        count = 0
-        
-        for punct in self.sentence_endings:
-            # Add EOS after each sentence-ending punctuation
-            pattern = f'{re.escape(punct)}'
-            replacement = f'{punct}{self.SPECIAL_TOKENS["EOS"]}'
-            
-            # Count occurrences
-            count += text.count(punct)
-            
-            # Replace
-            text = text.replace(punct, replacement)
+        # Add EOS after each sentence-ending punctuation in a single pass;
+        # subn also returns the number of sentences found
+        text, count = self._eos_re.subn(r'\g<0>' + self.SPECIAL_TOKENS['EOS'], text)
         
         return text, count
     
@@ -81,39 +75,38 @@ class SpecialTokenInjector:
     
     def process_text(self, text):
         """Add all special tokens to text"""
+        text, stats = self._mark_text(text)
+        self._update_stats(stats)
+        return text
+    
+    def _mark_text(self, text):
+        """Add all special tokens to text, returning the stats instead of recording them"""
         # Step 1: Add sentence markers
         text, sentence_count = self.add_sentence_markers(text)
-        self.stats['total_sentences'] += sentence_count
         
         # Step 2: Add paragraph markers
         text, paragraph_count = self.add_paragraph_markers(text)
-        self.stats['total_paragraphs'] += paragraph_count
         
         # Step 3: Add story end marker
         text = self.add_story_marker(text)
-        self.stats['total_stories'] += 1
         
-        return text
+        stats = {
+            'total_sentences': sentence_count,
+            'total_paragraphs': paragraph_count,
+            'total_stories': 1,
+        }
+        return text, stats
+    
+    def _update_stats(self, stats):
+        """Add per-file stats to the running totals"""
+        for key, value in stats.items():
+            self.stats[key] += value
     
     def process_file(self, input_path, output_path):
         """Process a single file"""
-        try:
-            # Read file
-            with open(input_path, 'r', encoding='utf-8') as f:
-                text = f.read()
-            
-            # Add special tokens
-            marked_text = self.process_text(text)
-            
-            # Save
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(marked_text)
-            
-            return True
-            
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-            return False
+        success, stats = _inject_file((self, input_path, output_path))
+        self._update_stats(stats)
+        return success
     
     def process_directory(self):
         """Process all files in directory"""
@@ -145,16 +138,21 @@ class SpecialTokenInjector:
         
         print(f"Found {len(text_files)} files\n")
         
-        # Process files
-        for i, input_file in enumerate(text_files, 1):
-            filename = input_file.name
-            output_file = Path(self.output_dir) / filename
-            
-            print(f"[{i:3d}/{len(text_files)}] {filename}")
+        # Process files in parallel; workers return their stats, which are
+        # added up here
+        tasks = [(self, input_file, Path(self.output_dir) / input_file.name)
+                 for input_file in text_files]
+        
+        with ProcessPoolExecutor() as executor:
+            results = executor.map(_inject_file, tasks, chunksize=16)
             
-            if self.process_file(input_file, output_file):
-                self.stats['files_processed'] += 1
-                print(f"          ✓ Tokens added")
+            for i, (input_file, (success, stats)) in enumerate(zip(text_files, results), 1):
+                print(f"[{i:3d}/{len(text_files)}] {input_file.name}")
+                
+                if success:
+                    self.stats['files_processed'] += 1
+                    self._update_stats(stats)
+                    print(f"          ✓ Tokens added")
         
         # Print summary
         self._print_summary()
@@ -188,7 +186,14 @@ class SpecialTokenInjector:
             print(f"✗ Directory not found: {self.output_dir}")
             return
         
-        text_files = sorted(output_path.glob('*.txt'))
+        # (path, size) pairs; the size lets empty files be skipped without
+        # opening them (on Windows scandir already has it, elsewhere
+        # entry.stat() makes one stat call per file)
+        text_files = sorted(
+            (entry.path, entry.stat().st_size)
+            for entry in os.scandir(output_path)
+            if entry.is_file() and entry.name.endswith('.txt')
+        )
         
         if not text_files:
             print(f"✗ No files found")
@@ -196,14 +201,14 @@ class SpecialTokenInjector:
         
         corpus_path = os.path.join(os.getcwd(), corpus_filename)
         
-        with open(corpus_path, 'w', encoding='utf-8') as corpus:
-            for text_file in text_files:
-                with open(text_file, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                
-                if content:
-                    corpus.write(content)
-                    corpus.write('\n\n')  # Separate stories
+        # Tokenized files are already stripped UTF-8 (see add_story_marker),
+        # so stream the raw bytes across instead of decoding and re-encoding
+        with open(corpus_path, 'wb') as corpus:
+            for text_file, size in text_files:
+                if size:
+                    with open(text_file, 'rb') as f:
+                        shutil.copyfileobj(f, corpus, 1 << 20)
+                    corpus.write(b'\n\n')  # Separate stories
         
         corpus_size = os.path.getsize(corpus_path)
         print(f"✓ Corpus created: {corpus_path}")
@@ -291,6 +296,35 @@ class SpecialTokenInjector:
         print("\n" + "=" * 80)
 
 
+def _inject_file(task):
+    """
+    Add special tokens to a single file
+    
+    Module-level so it can be sent to worker processes.
+    task: (injector, input_path, output_path)
+    Returns: (success, stats)
+    """
+    injector, input_path, output_path = task
+    
+    try:
+        # Read file
+        with open(input_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        
+        # Add special tokens
+        marked_text, stats = injector._mark_text(text)
+        
+        # Save
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(marked_text)
+        
+        return True, stats
+        
+    except Exception as e:
+        print(f"  ✗ Error: {e}")
+        return False, {}
+
+
 def main():
     """Main function"""
     print("\n" + "=" * 80)
@@ -10,9 +10,80 @@ Cleans and normalizes Urdu text files by:
 
 import os
 import re
+import shutil
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# Regex patterns, compiled once at import instead of on every call
+_RE_MULTI_DOT = re.compile(r'\.{2,}')
+_RE_MULTI_SPACE = re.compile(r' {2,}')
+# Whitespace run containing a newline; the lookbehind lets only the first
+# character of a run start a match, so long runs without one stay linear
+_RE_LINE_BREAK = re.compile(r'(?<!\s)\s*\n\s*')
+_RE_ENGLISH_WORD = re.compile(r'\b[a-zA-Z]+\b')
+
+# English punctuation to Urdu equivalents, and curly quotes to straight
+# ones. Applied with str.replace: on Urdu (non-ASCII) text that is much
+# faster than str.translate, which falls back to a per-character lookup
+_PUNCT_REPLACEMENTS = (
+    ('?', '؟'),
+    (';', '؛'),
+    (',', '،'),
+    ('\u201c', '"'),
+    ('\u201d', '"'),
+    ('\u2018', "'"),
+    ('\u2019', "'"),
+)
+
+# Urdu ad-related phrases, removed in this order
+_URDU_NOISE_PATTERNS = (
+    re.compile(r'اشتہار'),
+    re.compile(r'\(جاری ہے\)'),
+    re.compile(r'جاری ہے'),
+)
+
+# All noise (URLs, emails, HTML tags and common ad-related phrases), removed
+# one pattern after another in this order. They are not fused into one
+# alternation: removing a URL can leave text that the email pattern then
+# matches differently, and removing one phrase can join another
+_NOISE_PATTERNS = (
+    re.compile(r'https?://\S+'),
+    re.compile(r'www\.\S+'),
+    re.compile(r'\S+@\S+'),
+    re.compile(r'<[^>]+>'),
+    _URDU_NOISE_PATTERNS[0],
+    re.compile(r'advertisement', re.IGNORECASE),
+    re.compile(r'google', re.IGNORECASE),
+    re.compile(r'facebook', re.IGNORECASE),
+    re.compile(r'twitter', re.IGNORECASE),
+    re.compile(r'instagram', re.IGNORECASE),
+    re.compile(r'youtube', re.IGNORECASE),
+) + _URDU_NOISE_PATTERNS[1:]
+
+# Quick checks that let the noise and English-word steps skip most
+# patterns: without any of these characters the URL, email, tag and
+# English patterns can't match, so only the Urdu phrases are left to remove
+_RE_NOISE_HINT = re.compile(r'[A-Za-z<@]')
+_RE_ASCII_LETTER = re.compile(r'[A-Za-z]')
+
+
+class _CharTable(dict):
+    """
+    str.translate table that fills itself in lazily
+    
+    The first time a code point is looked up, classify(code) decides its
+    entry (the code itself to keep it, a replacement string, or None to
+    delete it) and the answer is stored for every later lookup.
+    """
+    def __init__(self, classify):
+        super().__init__()
+        self.classify = classify
+    
+    def __missing__(self, code):
+        value = self[code] = self.classify(code)
+        return value
+
 class UrduTextPreprocessor:
     def __init__(self, input_dir='urdu_stories_text', output_dir='urdu_stories_cleaned'):
         self.input_dir = input_dir
@@ -26,6 +97,13 @@ class UrduTextPreprocessor:
             (0xFE70, 0xFEFF),  # Arabic Presentation Forms-B
         ]
         
+        # Lookup table over the BMP: 1 where the code point is Urdu
+        self._urdu_bitmap = bytearray(0x10000)
+        for start, end in self.urdu_ranges:
+            if start < 0x10000:
+                end = min(end, 0xFFFF)
+                self._urdu_bitmap[start:end + 1] = b'\x01' * (end - start + 1)
+        
         # Common Urdu punctuation and symbols to keep
         self.keep_punctuation = set([
             '۔', '،', '؛', '؟', '!', ':', ';', 
@@ -38,9 +116,27 @@ class UrduTextPreprocessor:
             '\n', ' ', '\t'
         ])
         
+        # Translate table for remove_english_and_non_urdu, built lazily
+        self._translate_table = _CharTable(self._classify_char)
+        
+        # Cleaning steps run by clean_text, in order
+        self._pipeline = [
+            self.remove_metadata_header,         # Step 1: Remove metadata header
+            self.normalize_unicode,              # Step 2: Normalize Unicode
+            self.remove_common_noise,            # Step 3: Remove common noise
+            self.remove_english_and_non_urdu,    # Step 4: Remove English and non-Urdu characters
+            self.remove_isolated_english_words,  # Step 5: Remove isolated English words (cleanup)
+            self.standardize_punctuation,        # Step 6: Standardize punctuation
+            self.remove_extra_whitespace,        # Step 7: Remove extra whitespace
+        ]
+        
     def is_urdu_char(self, char):
         """Check if character is in Urdu Unicode range"""
         code = ord(char)
+        if code < 0x10000:
+            return self._urdu_bitmap[code] == 1
+        
+        # Outside the BMP: fall back to the range check
         for start, end in self.urdu_ranges:
             if start <= code <= end:
                 return True
@@ -48,11 +144,9 @@ class UrduTextPreprocessor:
     
     def normalize_unicode(self, text):
         """Normalize Unicode characters to their canonical form"""
-        # NFD normalization - decomposes characters
-        text = unicodedata.normalize('NFD', text)
-        # NFC normalization - recomposes to standard form
-        text = unicodedata.normalize('NFC', text)
-        return text
+        # NFC normalization - decomposes and recomposes to standard form
+        # (NFC already does the NFD step internally)
+        return unicodedata.normalize('NFC', text)
     
     def remove_metadata_header(self, text):
         """Remove the metadata header (Title, URL, etc.)"""
@@ -62,38 +156,34 @@ class UrduTextPreprocessor:
             return parts[1].strip()
         return text.strip()
     
+    def _classify_char(self, code):
+        """Translate table entry for one code point"""
+        char = chr(code)
+        
+        # Keep if it's Urdu or allowed punctuation
+        if self.is_urdu_char(char) or char in self.keep_punctuation:
+            return code
+        # Replace other whitespace with space
+        if char.isspace():
+            return ' '
+        # Drop everything else
+        return None
+    
     def remove_english_and_non_urdu(self, text):
         """Remove English characters and keep only Urdu + allowed punctuation"""
-        cleaned_chars = []
-        
-        for char in text:
-            # Keep if it's Urdu or allowed punctuation
-            if self.is_urdu_char(char) or char in self.keep_punctuation:
-                cleaned_chars.append(char)
-            # Replace other characters with space
-            elif char.isspace():
-                cleaned_chars.append(' ')
-        
-        return ''.join(cleaned_chars)
+        # One str.translate call runs the whole filter in C; each code
+        # point is classified once and cached in the table
+        return text.translate(self._translate_table)
     
     def standardize_punctuation(self, text):
         """Standardize punctuation marks"""
         # Replace multiple dots with Urdu full stop
-        text = re.sub(r'\.{2,}', '۔', text)
+        text = _RE_MULTI_DOT.sub('۔', text)
         
-        # Replace English punctuation with Urdu equivalents
-        replacements = {
-            '?': '؟',
-            ';': '؛',
-            ',': '،',
-        }
-        
-        for eng, urdu in replacements.items():
-            text = text.replace(eng, urdu)
-        
-        # Standardize quotes
-        text = re.sub(r'[""]', '"', text)
-        text = re.sub(r"['']", "'", text)
+        # Replace English punctuation with Urdu equivalents and
+        # standardize quotes
+        for old, new in _PUNCT_REPLACEMENTS:
+            text = text.replace(old, new)
         
         # Ensure Urdu full stop at end if missing
         text = text.strip()
@@ -106,101 +196,46 @@ class UrduTextPreprocessor:
     def remove_extra_whitespace(self, text):
         """Remove excessive whitespace while preserving paragraph structure"""
         # Replace multiple spaces with single space
-        text = re.sub(r' +', ' ', text)
-        
-        # Replace multiple newlines with double newline (paragraph break)
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = _RE_MULTI_SPACE.sub(' ', text).strip()
         
-        # Remove spaces at start/end of lines
-        lines = [line.strip() for line in text.split('\n')]
-        text = '\n'.join(lines)
-        
-        # Remove empty lines
-        lines = [line for line in text.split('\n') if line.strip()]
-        text = '\n\n'.join(lines)
-        
-        return text.strip()
+        # Any whitespace run that crosses a line break (line-end spaces,
+        # blank lines, next line's indent) becomes one paragraph break
+        return _RE_LINE_BREAK.sub('\n\n', text)
     
     def remove_common_noise(self, text):
         """Remove common noise patterns"""
-        # Remove URLs
-        text = re.sub(r'https?://\S+', '', text)
-        text = re.sub(r'www\.\S+', '', text)
-        
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
-        
-        # Remove HTML tags (if any remain)
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        # Remove common ad-related phrases
-        noise_patterns = [
-            r'اشتہار',
-            r'advertisement',
-            r'google',
-            r'facebook',
-            r'twitter',
-            r'instagram',
-            r'youtube',
-            r'جاری ہے',
-            r'\(جاری ہے\)',
-        ]
-        
-        for pattern in noise_patterns:
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-        
+        # Already-clean Urdu text only needs the Urdu phrases removed
+        if not _RE_NOISE_HINT.search(text):
+            patterns = _URDU_NOISE_PATTERNS
+        else:
+            # Remove URLs, email addresses, HTML tags (if any remain) and
+            # common ad-related phrases
+            patterns = _NOISE_PATTERNS
+        
+        for pattern in patterns:
+            text = pattern.sub('', text)
         return text
     
     def remove_isolated_english_words(self, text):
         """Remove standalone English words that might have been missed"""
+        # Nothing to do without any English letters (always the case after
+        # remove_english_and_non_urdu)
+        if not _RE_ASCII_LETTER.search(text):
+            return text
+        
         # Remove words that are purely English letters
-        text = re.sub(r'\b[a-zA-Z]+\b', ' ', text)
+        text = _RE_ENGLISH_WORD.sub(' ', text)
         return text
     
     def clean_text(self, text):
         """Apply all cleaning steps"""
-        # Step 1: Remove metadata header
-        text = self.remove_metadata_header(text)
-        
-        # Step 2: Normalize Unicode
-        text = self.normalize_unicode(text)
-        
-        # Step 3: Remove common noise
-        text = self.remove_common_noise(text)
-        
-        # Step 4: Remove English and non-Urdu characters
-        text = self.remove_english_and_non_urdu(text)
-        
-        # Step 5: Remove isolated English words (cleanup)
-        text = self.remove_isolated_english_words(text)
-        
-        # Step 6: Standardize punctuation
-        text = self.standardize_punctuation(text)
-        
-        # Step 7: Remove extra whitespace
-        text = self.remove_extra_whitespace(text)
-        
+        for step in self._pipeline:
+            text = step(text)
         return text
     
     def process_file(self, input_path, output_path):
         """Process a single file"""
-        try:
-            # Read original file
-            with open(input_path, 'r', encoding='utf-8') as f:
-                original_text = f.read()
-            
-            # Clean the text
-            cleaned_text = self.clean_text(original_text)
-            
-            # Save cleaned text
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(cleaned_text)
-            
-            return True, len(original_text), len(cleaned_text)
-            
-        except Exception as e:
-            print(f"✗ Error processing {input_path}: {e}")
-            return False, 0, 0
+        return _clean_file((self, input_path, output_path))
     
     def process_directory(self):
         """Process all files in the input directory"""
@@ -221,7 +256,7 @@ class UrduTextPreprocessor:
             print(f"  Make sure the directory exists in: {os.getcwd()}")
             return
         
-        text_files = list(input_path.glob('*.txt'))
+        text_files = sorted(input_path.glob('*.txt'))
         
         if not text_files:
             print(f"✗ No .txt files found in {self.input_dir}")
@@ -229,27 +264,31 @@ class UrduTextPreprocessor:
         
         print(f"Found {len(text_files)} files to process\n")
         
-        # Process each file
+        # Process files in parallel; results come back in input order, so
+        # progress is still printed file by file
         total_original_size = 0
         total_cleaned_size = 0
         success_count = 0
         
-        for i, input_file in enumerate(text_files, 1):
-            filename = input_file.name
-            output_file = Path(self.output_dir) / filename
-            
-            print(f"[{i}/{len(text_files)}] Processing: {filename}")
-            
-            success, orig_size, clean_size = self.process_file(input_file, output_file)
+        tasks = [(self, input_file, Path(self.output_dir) / input_file.name)
+                 for input_file in text_files]
+        workers = os.cpu_count() or 1
+        chunksize = max(1, len(tasks) // (4 * workers))
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_clean_file, tasks, chunksize=chunksize)
             
-            if success:
-                success_count += 1
-                total_original_size += orig_size
-                total_cleaned_size += clean_size
-                reduction = ((orig_size - clean_size) / orig_size * 100) if orig_size > 0 else 0
-                print(f"  ✓ Cleaned: {orig_size} → {clean_size} chars ({reduction:.1f}% reduction)")
-            else:
-                print(f"  ✗ Failed")
+            for i, (input_file, (success, orig_size, clean_size)) in enumerate(zip(text_files, results), 1):
+                print(f"[{i}/{len(text_files)}] Processing: {input_file.name}")
+                
+                if success:
+                    success_count += 1
+                    total_original_size += orig_size
+                    total_cleaned_size += clean_size
+                    reduction = ((orig_size - clean_size) / orig_size * 100) if orig_size > 0 else 0
+                    print(f"  ✓ Cleaned: {orig_size} → {clean_size} chars ({reduction:.1f}% reduction)")
+                else:
+                    print(f"  ✗ Failed")
         
         # Print summary
         print("\n" + "=" * 80)
@@ -275,7 +314,14 @@ class UrduTextPreprocessor:
             print(f"✗ Output directory not found: {self.output_dir}")
             return
         
-        text_files = sorted(cleaned_path.glob('*.txt'))
+        # (path, size) pairs; the size lets empty files be skipped without
+        # opening them (on Windows scandir already has it, elsewhere
+        # entry.stat() makes one stat call per file)
+        text_files = sorted(
+            (entry.path, entry.stat().st_size)
+            for entry in os.scandir(cleaned_path)
+            if entry.is_file() and entry.name.endswith('.txt')
+        )
         
         if not text_files:
             print(f"✗ No cleaned files found in {self.output_dir}")
@@ -283,14 +329,14 @@ class UrduTextPreprocessor:
         
         corpus_path = os.path.join(os.getcwd(), corpus_filename)
         
-        with open(corpus_path, 'w', encoding='utf-8') as corpus:
-            for i, text_file in enumerate(text_files, 1):
-                with open(text_file, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                
-                if content:
-                    corpus.write(content)
-                    corpus.write('\n\n')  # Separate stories with blank line
+        # Cleaned files are already stripped UTF-8 (see remove_extra_whitespace),
+        # so stream the raw bytes across instead of decoding and re-encoding
+        with open(corpus_path, 'wb') as corpus:
+            for text_file, size in text_files:
+                if size:
+                    with open(text_file, 'rb') as f:
+                        _copy_file(f, corpus)
+                    corpus.write(b'\n\n')  # Separate stories with blank line
         
         print(f"✓ Corpus created: {corpus_path}")
         print(f"  Combined {len(text_files)} stories")
@@ -300,6 +346,67 @@ class UrduTextPreprocessor:
         print(f"  Size: {corpus_size:,} bytes")
 
 
+def _copy_file(src, dst):
+    """
+    Append the contents of src to dst (both binary files)
+    
+    Where the OS supports it (Linux) the data is copied inside the kernel
+    with copy_file_range, without passing through Python buffers; anything
+    that can't be copied that way goes through shutil.copyfileobj.
+    """
+    if hasattr(os, 'copy_file_range'):
+        # Anything still buffered in dst must land before the kernel copy
+        dst.flush()
+        try:
+            # Copy until the end of src, however big it is by now
+            copied = os.copy_file_range(src.fileno(), dst.fileno(), 1 << 30)
+            if copied:
+                while copied:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), 1 << 30)
+                return
+            # Some file systems return 0 instead of raising when they can't
+            # do the copy; fall back below
+        except OSError:
+            # Not supported for these files (e.g. across file systems on
+            # older kernels); carry on from wherever the copy stopped
+            pass
+    
+    shutil.copyfileobj(src, dst, 1 << 20)
+
+
+def _clean_file(task):
+    """
+    Clean a single file
+    
+    Module-level so it can be sent to worker processes.
+    task: (preprocessor, input_path, output_path)
+    Returns: (success, original_length, cleaned_length)
+    """
+    preprocessor, input_path, output_path = task
+    
+    try:
+        # Read original file; one bytes read and one decode is cheaper than
+        # the text-mode reader. Line endings are translated the same way
+        # text mode would
+        with open(input_path, 'rb') as f:
+            original_text = f.read().decode('utf-8')
+        if '\r' in original_text:
+            original_text = original_text.replace('\r\n', '\n').replace('\r', '\n')
+        
+        # Clean the text
+        cleaned_text = preprocessor.clean_text(original_text)
+        
+        # Save cleaned text
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(cleaned_text)
+        
+        return True, len(original_text), len(cleaned_text)
+        
+    except Exception as e:
+        print(f"✗ Error processing {input_path}: {e}")
+        return False, 0, 0
+
+
 def main():
     """Main function"""
     print("\n" + "=" * 80)
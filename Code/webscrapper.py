@@ -22,24 +22,173 @@ except ImportError as e:
     print("=" * 80)
     exit(1)
 
+# Optional: fetch static story pages over plain HTTP instead of through the
+# browser. Without these packages every story goes through Selenium
+try:
+    import requests
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    requests = None
+    HTMLParser = None
+
+# Optional: faster JSON writer, falls back to the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 import json
 import time
 import csv
 import os
 import random
 import re
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Lines of extracted story text that are ads or page furniture
+_AD_LINE_RE = re.compile(
+    r'advertisement|اشتہار|google_ads|teads|gpt-|googletag|فریق ثالث|جاری ہے',
+    re.IGNORECASE
+)
+
+# Source-code whitespace in HTML text, which the browser's innerText
+# collapses to one space
+_HTML_WS_RE = re.compile(r'[ \t\r\n\f]+')
 
 class UrduStoryAutoScraper:
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    
+    # Story containers and the ad/script elements to strip from them; shared
+    # by the browser script and the HTTP fast path
+    _TXT_DETAIL = 'div.txt_detail.urdu'
+    _TXT_DETAIL_UNWANTED = (
+        'div.txt_banner, '
+        '[id*="ad"], [id*="gpt"], [id*="teads"], '
+        '[class*="ad"], [class*="banner"], '
+        'script, style, iframe, noscript, '
+        '[data-id]'
+    )
+    _RIGHT_DIVS = 'div[style*="text-align: right"], div[style*="text-align:right"]'
+    _RIGHT_DIVS_UNWANTED = (
+        '[id*="ad"], [id*="gpt"], [id*="teads"], [class*="ad"], '
+        'script, style, iframe, noscript, [class*="banner"]'
+    )
+    
+    # Browser-side extraction script, built once and sent unchanged for
+    # every story
+    _EXTRACT_JS = """
+        const TXT_DETAIL = %s;
+        const TXT_DETAIL_UNWANTED = %s;
+        const RIGHT_DIVS = %s;
+        const RIGHT_DIVS_UNWANTED = %s;
+        
+        let content = '';
+        
+        // Method 1: Try txt_detail container (new format from page 13+)
+        let txtDetail = document.querySelector(TXT_DETAIL);
+        if (txtDetail) {
+            let clone = txtDetail.cloneNode(true);
+            
+            // Remove all unwanted elements
+            clone.querySelectorAll(TXT_DETAIL_UNWANTED).forEach(el => el.remove());
+            
+            let text = clone.innerText || clone.textContent;
+            if (text && text.length > 100) {
+                content = text.trim();
+            }
+        }
+        
+        // Method 2: If not found, try right-aligned divs (old format)
+        if (!content || content.length < 100) {
+            document.querySelectorAll(RIGHT_DIVS).forEach(div => {
+                let clone = div.cloneNode(true);
+                
+                clone.querySelectorAll(RIGHT_DIVS_UNWANTED).forEach(el => el.remove());
+                
+                let text = clone.innerText || clone.textContent;
+                if (text && text.length > 100) {
+                    content += text.trim() + '\\n\\n';
+                }
+            });
+        }
+        
+        // Method 3: Try to find by common classes
+        if (!content || content.length < 100) {
+            let containers = document.querySelectorAll(
+                'div.urdu, div.rtl, div.story, div.content, article'
+            );
+            
+            containers.forEach(container => {
+                if (container.innerText && container.innerText.length > 200) {
+                    let clone = container.cloneNode(true);
+                    
+                    clone.querySelectorAll('[id*="ad"], script, style, iframe').forEach(el => el.remove());
+                    
+                    let text = clone.innerText || clone.textContent;
+                    if (text && text.length > content.length) {
+                        content = text.trim();
+                    }
+                }
+            });
+        }
+        
+        return content.trim();
+    """ % tuple(map(json.dumps, (_TXT_DETAIL, _TXT_DETAIL_UNWANTED,
+                                 _RIGHT_DIVS, _RIGHT_DIVS_UNWANTED)))
+    
     def __init__(self, base_url="https://www.urdupoint.com/kids/section/stories.html", headless=False):
         self.base_url = base_url
         self.stories = []
         self.headless = headless
         self.driver = None
         
+        # Extra browsers used to fetch story pages in parallel, started only
+        # when a story needs one; idle ones wait in the queue until a worker
+        # thread takes them
+        self.worker_drivers = []
+        self._idle_drivers = queue.Queue()
+        self._driver_lock = threading.Lock()
+        self._driver_path = None
+        
+        # HTTP session for the fast path (None when it isn't available)
+        self.session = None
+        
     def init_driver(self):
         """Initialize Chrome driver"""
         print("Initializing browser...")
         
+        try:
+            self.driver = self._create_driver()
+            print("✓ Browser initialized successfully!")
+            
+        except Exception as e:
+            print(f"\n✗ Error: {e}")
+            raise
+    
+    def _get_worker_driver(self):
+        """Take an idle worker browser, starting a new one if none is free"""
+        try:
+            return self._idle_drivers.get_nowait()
+        except queue.Empty:
+            pass
+        
+        # Each browser-worker thread holds at most one driver, so this never
+        # starts more browsers than there are worker threads
+        with self._driver_lock:
+            print(f"Starting story browser {len(self.worker_drivers) + 1}...")
+            try:
+                driver = self._create_driver()
+            except Exception as e:
+                print(f"\n✗ Error: {e}")
+                raise
+            self.worker_drivers.append(driver)
+        
+        return driver
+    
+    def _create_driver(self):
+        """Create and configure a new Chrome driver"""
         chrome_options = Options()
         
         if self.headless:
@@ -50,7 +199,7 @@ class UrduStoryAutoScraper:
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+        chrome_options.add_argument(f'user-agent={self.USER_AGENT}')
         
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
@@ -61,24 +210,28 @@ class UrduStoryAutoScraper:
         }
         chrome_options.add_experimental_option("prefs", prefs)
         
-        try:
+        # Only download/update ChromeDriver once, not once per browser
+        if self._driver_path is None:
             print("Downloading/updating ChromeDriver...")
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            
-            self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {
-                "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            })
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-            print("✓ Browser initialized successfully!")
-            
-        except Exception as e:
-            print(f"\n✗ Error: {e}")
-            raise
+            self._driver_path = ChromeDriverManager().install()
+        
+        service = Service(self._driver_path)
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+        
+        driver.execute_cdp_cmd('Network.setUserAgentOverride', {
+            "userAgent": self.USER_AGENT
+        })
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        
+        return driver
     
     def close_driver(self):
         """Close the browser"""
+        for driver in self.worker_drivers:
+            driver.quit()
+        self.worker_drivers = []
+        self._idle_drivers = queue.Queue()
+        
         if self.driver:
             self.driver.quit()
             print("✓ Browser closed")
@@ -145,112 +298,133 @@ class UrduStoryAutoScraper:
             print(f"  ✗ Error: {e}")
             return []
     
-    def extract_story_content(self, story_url):
+    def extract_story_content(self, story_url, driver=None):
         """Extract story content - improved to handle multiple HTML structures"""
+        # Workers pass their own driver; default to the main browser
+        driver = driver or self.driver
+        
         try:
-            self.driver.get(story_url)
+            driver.get(story_url)
             time.sleep(random.uniform(2, 3))
             
             # Scroll to load all content
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             time.sleep(1)
             
             # IMPROVED EXTRACTION - handles multiple content structures
-            script = """
-                let content = '';
-                
-                // Method 1: Try txt_detail container (new format from page 13+)
-                let txtDetail = document.querySelector('div.txt_detail.urdu');
-                if (txtDetail) {
-                    let clone = txtDetail.cloneNode(true);
-                    
-                    // Remove all unwanted elements
-                    let unwanted = clone.querySelectorAll(
-                        'div.txt_banner, ' +
-                        '[id*="ad"], [id*="gpt"], [id*="teads"], ' +
-                        '[class*="ad"], [class*="banner"], ' +
-                        'script, style, iframe, noscript, ' +
-                        '[data-id]'
-                    );
-                    unwanted.forEach(el => el.remove());
-                    
-                    let text = clone.innerText || clone.textContent;
-                    if (text && text.length > 100) {
-                        content = text.trim();
-                    }
-                }
-                
-                // Method 2: If not found, try right-aligned divs (old format)
-                if (!content || content.length < 100) {
-                    let divs = document.querySelectorAll('div[style*="text-align: right"], div[style*="text-align:right"]');
-                    
-                    divs.forEach(div => {
-                        let clone = div.cloneNode(true);
-                        
-                        let unwanted = clone.querySelectorAll(
-                            '[id*="ad"], [id*="gpt"], [id*="teads"], [class*="ad"], ' +
-                            'script, style, iframe, noscript, [class*="banner"]'
-                        );
-                        unwanted.forEach(el => el.remove());
-                        
-                        let text = clone.innerText || clone.textContent;
-                        if (text && text.length > 100) {
-                            content += text.trim() + '\\n\\n';
-                        }
-                    });
-                }
-                
-                // Method 3: Try to find by common classes
-                if (!content || content.length < 100) {
-                    let containers = document.querySelectorAll(
-                        'div.urdu, div.rtl, div.story, div.content, article'
-                    );
-                    
-                    containers.forEach(container => {
-                        if (container.innerText && container.innerText.length > 200) {
-                            let clone = container.cloneNode(true);
-                            
-                            let unwanted = clone.querySelectorAll(
-                                '[id*="ad"], script, style, iframe'
-                            );
-                            unwanted.forEach(el => el.remove());
-                            
-                            let text = clone.innerText || clone.textContent;
-                            if (text && text.length > content.length) {
-                                content = text.trim();
-                            }
-                        }
-                    });
-                }
-                
-                return content.trim();
-            """
+            story_content = driver.execute_script(self._EXTRACT_JS)
             
-            story_content = self.driver.execute_script(script)
+            return self._clean_story_content(story_content)
             
-            # Clean up content
-            if story_content:
-                lines = []
-                for line in story_content.split('\n'):
-                    line = line.strip()
-                    # Skip empty lines and ad-related content
-                    if line and not any(
-                        keyword in line.lower() for keyword in [
-                            'advertisement', 'اشتہار', 'google_ads', 'teads', 
-                            'gpt-', 'googletag', 'فریق ثالث', 'جاری ہے'
-                        ]
-                    ):
-                        lines.append(line)
-                
-                story_content = '\n'.join(lines)
+        except Exception as e:
+            print(f"  ✗ Extraction error: {e}")
+            return None
+    
+    def extract_story_content_fast(self, session, story_url):
+        """Extract story content from the static HTML, without a browser"""
+        try:
+            response = session.get(story_url, timeout=15)
+            response.raise_for_status()
+            
+            # Without a charset in the header requests assumes ISO-8859-1,
+            # which turns the Urdu text into mojibake; the pages are UTF-8
+            if 'charset' not in response.headers.get('Content-Type', '').lower():
+                response.encoding = 'utf-8'
+            tree = HTMLParser(response.text)
+            
+            content = ''
+            
+            # Method 1: txt_detail container (new format from page 13+)
+            txt_detail = tree.css_first(self._TXT_DETAIL)
+            if txt_detail:
+                text = self._node_text(txt_detail, self._TXT_DETAIL_UNWANTED)
+                if len(text) > 100:
+                    content = text
             
-            return story_content if story_content and len(story_content) > 100 else None
+            # Method 2: right-aligned divs (old format)
+            if len(content) < 100:
+                for div in tree.css(self._RIGHT_DIVS):
+                    text = self._node_text(div, self._RIGHT_DIVS_UNWANTED)
+                    if len(text) > 100:
+                        content += text + '\n\n'
+            
+            # Anything else (e.g. content built by JS) is left to Selenium
+            return self._clean_story_content(content.strip())
             
         except Exception as e:
-            print(f"  ✗ Extraction error: {e}")
+            print(f"  ⚠ Fast extraction failed, using browser: {e}")
             return None
     
-    def scrape_stories(self, max_stories=200):
+    def _node_text(self, node, unwanted):
+        """Text of an HTML node without its ad/script children"""
+        for el in node.css(unwanted):
+            el.decompose()
+        
+        # Mark where the browser's innerText puts line breaks: after <br>,
+        # and around block elements. NUL can't occur in parsed HTML text,
+        # so the marks survive the whitespace collapsing below
+        for el in node.css('br'):
+            el.insert_after('\0')
+        for el in node.css('p, div'):
+            el.insert_before('\0')
+            el.insert_after('\0')
+        
+        # Newlines in the HTML source are just spaces, as in innerText
+        text = _HTML_WS_RE.sub(' ', node.text(separator=''))
+        return text.replace('\0', '\n').strip()
+    
+    def _clean_story_content(self, story_content):
+        """Drop blank and ad-related lines; None if too little is left"""
+        if story_content:
+            # Skip empty lines and ad-related content
+            lines = [line for line in map(str.strip, story_content.split('\n'))
+                     if line and not _AD_LINE_RE.search(line)]
+            
+            story_content = '\n'.join(lines)
+        
+        return story_content if story_content and len(story_content) > 100 else None
+    
+    def _fetch_story_http(self, story_info):
+        """Extract one story over HTTP"""
+        content = self.extract_story_content_fast(self.session, story_info['url'])
+        
+        # Short polite delay, random per request so the fetches spread out
+        time.sleep(random.uniform(0.5, 1.5))
+        
+        return content
+    
+    def _fetch_story_browser(self, story_info):
+        """Extract one story on whichever worker browser is free"""
+        driver = self._get_worker_driver()
+        try:
+            content = self.extract_story_content(story_info['url'], driver)
+            
+            # Delay between stories; random per worker so the workers
+            # don't all hit the site at the same moment
+            time.sleep(random.uniform(2, 4))
+        finally:
+            self._idle_drivers.put(driver)
+        
+        return content
+    
+    def _fetch_stories(self, story_links, http_executor, browser_executor):
+        """Extract a page's stories, in page order; None where extraction failed"""
+        contents = [None] * len(story_links)
+        
+        # Plain HTTP first, many requests in flight at once
+        if self.session is not None:
+            contents = list(http_executor.map(self._fetch_story_http, story_links))
+        
+        # Whatever that missed goes through the (fewer, slower) browsers
+        missing = [i for i, content in enumerate(contents) if not content]
+        retried = browser_executor.map(self._fetch_story_browser,
+                                       [story_links[i] for i in missing])
+        for i, content in zip(missing, retried):
+            contents[i] = content
+        
+        return contents
+    
+    def scrape_stories(self, max_stories=200, workers=4, http_workers=10):
         """Main scraping method"""
         print("\n" + "=" * 80)
         print("URDU STORIES AUTO-SCRAPER - IMPROVED VERSION")
@@ -258,9 +432,25 @@ class UrduStoryAutoScraper:
         print(f"Target: {max_stories} stories")
         print("Total pages available: 173")
         print("Improved content extraction for all page formats")
+        print(f"Story workers: {workers}")
+        if requests is not None:
+            print(f"HTTP fast path: on ({http_workers} requests in flight)")
+        else:
+            print("HTTP fast path: off (pip install requests selectolax)")
         print("=" * 80 + "\n")
         
+        if requests is not None:
+            # One keep-alive session shared by the HTTP workers, with a
+            # connection pool big enough that none of them has to wait
+            self.session = requests.Session()
+            self.session.headers['User-Agent'] = self.USER_AGENT
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=http_workers)
+            self.session.mount('https://', adapter)
+            self.session.mount('http://', adapter)
+        
         self.init_driver()
+        executor = ThreadPoolExecutor(max_workers=workers)
+        http_executor = ThreadPoolExecutor(max_workers=http_workers)
         
         try:
             current_page_num = 0
@@ -288,17 +478,16 @@ class UrduStoryAutoScraper:
                     current_page_num += 1
                     continue
                 
-                # Process each story
+                # Process the page's stories in parallel; results come back
+                # in page order
+                story_links = story_links[:max_stories - len(self.stories)]
+                contents = self._fetch_stories(story_links, http_executor, executor)
+                
                 page_failed = 0
-                for story_info in story_links:
-                    if len(self.stories) >= max_stories:
-                        break
-                    
+                for story_info, content in zip(story_links, contents):
                     story_num = len(self.stories) + 1
                     print(f"\n[{story_num}/{max_stories}] 📝 {story_info['title_english']}")
                     
-                    content = self.extract_story_content(story_info['url'])
-                    
                     if content and len(content) > 100:
                         story_data = {
                             'id': story_num,
@@ -321,9 +510,6 @@ class UrduStoryAutoScraper:
                         # If too many consecutive failures, might be a problem
                         if failed_count >= max_consecutive_fails:
                             print(f"\n  ⚠ Warning: {failed_count} consecutive failures!")
-                    
-                    # Delay between stories
-                    time.sleep(random.uniform(2, 4))
                 
                 # Report page results
                 print(f"\n  Page summary: {len(story_links) - page_failed}/{len(story_links)} stories extracted successfully")
@@ -338,7 +524,12 @@ class UrduStoryAutoScraper:
                         time.sleep(delay)
         
         finally:
+            executor.shutdown()
+            http_executor.shutdown()
             self.close_driver()
+            if self.session is not None:
+                self.session.close()
+                self.session = None
         
         print("\n" + "=" * 80)
         print(f"✅ SCRAPING COMPLETE!")
@@ -352,8 +543,13 @@ class UrduStoryAutoScraper:
     def save_to_json(self, filename='urdu_stories.json'):
         """Save to JSON"""
         filepath = os.path.join(os.getcwd(), filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.stories, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            # orjson writes UTF-8 bytes directly, same layout as below
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(self.stories, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(self.stories, f, ensure_ascii=False, indent=2)
         print(f"💾 JSON: {filepath}")
         return filepath
     
@@ -383,12 +579,15 @@ class UrduStoryAutoScraper:
             filename = f"{story['id']:03d}_{safe_title}.txt"
             filepath = os.path.join(dirpath, filename)
             
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(f"Title (Urdu): {story['title_urdu']}\n")
-                f.write(f"Title (English): {story['title_english']}\n")
-                f.write(f"URL: {story['url']}\n\n")
-                f.write("=" * 80 + "\n\n")
-                f.write(story['content'])
+            # Header and story go out in one write
+            with open(filepath, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.write(
+                    f"Title (Urdu): {story['title_urdu']}\n"
+                    f"Title (English): {story['title_english']}\n"
+                    f"URL: {story['url']}\n\n"
+                    f"{'=' * 80}\n\n"
+                    f"{story['content']}"
+                )
         
         print(f"💾 Text files: {dirpath}/")
         return dirpath